@@ -9,8 +9,10 @@ from . import organizations
 from . import plans
 from . import projects
 from . import runs
+from . import sessions
 from . import state_versions
 from . import state_version_outputs
+from . import token
 from . import variables
 from . import workspaces
 
@@ -23,8 +25,10 @@ __all__ = [
     "plans",
     "projects",
     "runs",
+    "sessions",
     "state_versions",
     "state_version_outputs",
+    "token",
     "variables",
     "workspaces",
 ]
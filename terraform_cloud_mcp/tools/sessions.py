@@ -7,8 +7,9 @@ Using FastMCP's native session state (3.0.0+), sessions are automatically
 isolated and support distributed storage backends.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 
 from fastmcp import Context
 from ..utils.session import (
@@ -17,14 +18,36 @@ from ..utils.session import (
     clear_session_context,
     get_session_context,
     set_session_context,
-    get_session_id_safe,
-    get_client_context,
+    get_client_fields,
     get_client_preferences,
+    get_session_id_safe,
 )
 from ..utils.decorators import handle_api_errors
 
 logger = logging.getLogger(__name__)
 
+# Static responses, copied on return so callers can't mutate the templates
+_NOTHING_TO_CLEAR_RESPONSE: Dict[str, Any] = {
+    "status": "info",
+    "message": "No items to clear (both flags set to False)"
+}
+_EMPTY_CONTEXT_ERROR: Dict[str, Any] = {
+    "error": "At least one context value (organization, workspace, or project) must be provided."
+}
+_NO_CLIENT_CONTEXT_RESPONSE: Dict[str, Any] = {
+    "status": "info",
+    "message": "No client context available for this session. "
+              "This is normal if the client doesn't send client context headers."
+}
+_OK_BASE: Dict[str, Any] = {"status": "success", "message": ""}
+
+
+def _ok(message: str) -> Dict[str, Any]:
+    """Build a success response from the shared base shape."""
+    response = _OK_BASE.copy()
+    response["message"] = message
+    return response
+
 
 @handle_api_errors
 async def get_session_status(ctx: Context) -> Dict[str, Any]:
@@ -86,30 +109,29 @@ async def clear_session(ctx: Context, clear_token: bool = True, clear_context: b
         >>> await clear_session(ctx, clear_token=True, clear_context=False)
         {"status": "success", "message": "Session token cleared"}
     """
-    session_id = get_session_id_safe(ctx)
-    cleared_items = []
+    clears: List[Tuple[str, Callable[[Context], Awaitable[Optional[str]]]]] = []
     
     if clear_token:
-        await clear_session_token(ctx)
-        cleared_items.append("token")
+        clears.append(("token", clear_session_token))
     
     if clear_context:
-        await clear_session_context(ctx)
-        cleared_items.append("context")
+        clears.append(("context", clear_session_context))
     
-    if not cleared_items:
-        return {
-            "status": "info",
-            "message": "No items to clear (both flags set to False)"
-        }
+    if not clears:
+        return _NOTHING_TO_CLEAR_RESPONSE.copy()
     
-    items_str = " + ".join(cleared_items)
-    logger.info(f"Session '{session_id}' cleared: {items_str}")
+    # Resolve the session ID once up front, so a missing x-session-id header
+    # fails (and is logged) once rather than in each concurrent clear
+    session_id = get_session_id_safe(ctx)
+    
+    # Token and context live under independent keys, so clear them concurrently
+    await asyncio.gather(*(clear(ctx) for _, clear in clears))
+    
+    items_str = " + ".join(name for name, _ in clears)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Session '{session_id}' cleared: {items_str}")
 
-    return {
-        "status": "success",
-        "message": f"Session cleared ({items_str}). Use set_token to configure a new token."
-    }
+    return _ok(f"Session cleared ({items_str}). Use set_token to configure a new token.")
 
 
 @handle_api_errors
@@ -146,31 +168,30 @@ async def set_context(
             }
         }
     """
-    if not any([organization, workspace, project]):
-        return {
-            "error": "At least one context value (organization, workspace, or project) must be provided."
-        }
-    
-    await set_session_context(ctx, organization=organization, workspace=workspace, project=project)
-    
-    # Get the updated context
-    updated_context = await get_session_context(ctx)
+    if not (organization or workspace or project):
+        return _EMPTY_CONTEXT_ERROR.copy()
     
-    set_items = []
-    if organization:
-        set_items.append(f"organization={organization}")
-    if workspace:
-        set_items.append(f"workspace={workspace}")
-    if project:
-        set_items.append(f"project={project}")
+    # set_session_context returns the merged context, no separate read needed
+    updated_context = await set_session_context(
+        ctx, organization=organization, workspace=workspace, project=project
+    )
     
-    logger.info(f"Context updated: {', '.join(set_items)}")
-
-    return {
-        "status": "success",
-        "message": "Context updated",
-        "context": updated_context
-    }
+    # Skip building the summary entirely when INFO logging is disabled
+    if logger.isEnabledFor(logging.INFO):
+        set_items = ", ".join(
+            f"{name}={value}"
+            for name, value in (
+                ("organization", organization),
+                ("workspace", workspace),
+                ("project", project),
+            )
+            if value
+        )
+        logger.info(f"Context updated: {set_items}")
+
+    response = _ok("Context updated")
+    response["context"] = updated_context
+    return response
 
 
 @handle_api_errors
@@ -230,28 +251,21 @@ async def get_client_context_tool(ctx: Context) -> Dict[str, Any]:
             }
         }
     """
-    client_ctx = await get_client_context(ctx)
+    # All fields live in the one stored client context, so a single read covers them
+    region, agent_name, timestamp, preferences = await get_client_fields(
+        ctx, 'region', 'agent_name', 'timestamp', 'preferences'
+    )
     
-    if not client_ctx:
-        return {
-            "status": "info",
-            "message": "No client context available for this session. "
-                      "This is normal if the client doesn't send client context headers."
-        }
-    
-    # Extract individual fields for cleaner response
-    region = await get_client_region(ctx)
-    agent = await get_client_agent(ctx)
-    timestamp = await get_client_timestamp(ctx)
-    preferences = await get_client_preferences(ctx)
+    if region is None and agent_name is None and timestamp is None and preferences is None:
+        return _NO_CLIENT_CONTEXT_RESPONSE.copy()
     
     return {
         "status": "success",
         "client_context": {
             "region": region,
-            "agent_name": agent,
+            "agent_name": agent_name,
             "timestamp": timestamp,
-            "preferences": preferences
+            "preferences": preferences or {}
         }
     }
 
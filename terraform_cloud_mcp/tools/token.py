@@ -12,11 +12,33 @@ import logging
 from typing import Dict, Any
 from fastmcp import Context
 
-from ..utils.session import set_session_token, get_session_token
+from ..utils.session import set_session_token, get_session_token, mask_token
 from ..utils.decorators import handle_api_errors
+from ..utils.env import get_tfc_token
 
 logger = logging.getLogger(__name__)
 
+# Static responses, copied on return so callers can't mutate the templates
+_EMPTY_TOKEN_ERROR: Dict[str, Any] = {
+    "error": "Token cannot be empty. Please provide a valid Terraform Cloud API token."
+}
+_TOKEN_SET_RESPONSE: Dict[str, Any] = {
+    "status": "success",
+    "message": "Token configured successfully. All subsequent tool calls will use this token."
+}
+_ENV_TOKEN_RESPONSE: Dict[str, Any] = {
+    "status": "configured",
+    "source": "environment",
+    "has_token": True,
+    "note": "Using TFC_TOKEN environment variable"
+}
+_NO_TOKEN_RESPONSE: Dict[str, Any] = {
+    "status": "not_configured",
+    "source": None,
+    "has_token": False,
+    "message": "No token configured. Use set_token() to configure a token."
+}
+
 
 @handle_api_errors
 async def set_token(token: str, ctx: Context) -> Dict[str, Any]:
@@ -43,23 +65,18 @@ async def set_token(token: str, ctx: Context) -> Dict[str, Any]:
         >>> await set_token("atlasv1.abc123...")
         {"status": "success", "message": "Token configured successfully"}
     """
-    if not token or not token.strip():
-        return {
-            "error": "Token cannot be empty. Please provide a valid Terraform Cloud API token."
-        }
+    # Strip whitespace once; an all-whitespace token counts as empty
+    clean_token = token.strip() if token else ""
+    if not clean_token:
+        return _EMPTY_TOKEN_ERROR.copy()
 
-    # Strip whitespace and store the token
-    clean_token = token.strip()
     await set_session_token(clean_token, ctx)
 
-    # Mask the token for logging
-    masked_token = f"{clean_token[:8]}...{clean_token[-4:]}" if len(clean_token) > 12 else "***"
-    logger.info(f"Token configured successfully via set_token (masked: {masked_token})")
+    # Only pay for masking when the log line will actually be emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Token configured successfully via set_token (masked: {mask_token(clean_token)})")
 
-    return {
-        "status": "success",
-        "message": "Token configured successfully. All subsequent tool calls will use this token."
-    }
+    return _TOKEN_SET_RESPONSE.copy()
 
 
 @handle_api_errors
@@ -82,27 +99,13 @@ async def get_current_token(ctx: Context) -> Dict[str, Any]:
     token = await get_session_token(ctx)
 
     if token:
-        masked_token = f"{token[:8]}...{token[-4:]}" if len(token) > 12 else "***"
         return {
             "status": "configured",
             "source": "session",
             "has_token": True,
-            "token_preview": masked_token
+            "token_preview": mask_token(token)
         }
+    elif get_tfc_token():
+        return _ENV_TOKEN_RESPONSE.copy()
     else:
-        import os
-        env_token = os.getenv("TFC_TOKEN")
-        if env_token:
-            return {
-                "status": "configured",
-                "source": "environment",
-                "has_token": True,
-                "note": "Using TFC_TOKEN environment variable"
-            }
-        else:
-            return {
-                "status": "not_configured",
-                "source": None,
-                "has_token": False,
-                "message": "No token configured. Use set_token() to configure a token."
-            }
+        return _NO_TOKEN_RESPONSE.copy()
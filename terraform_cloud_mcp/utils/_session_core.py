@@ -0,0 +1,136 @@
+"""Session state primitives shared by session and client_context
+
+Both modules store per-session data either through FastMCP's native session
+state API or, when the context doesn't expose it, in an in-memory fallback
+store. The choice is bound once per context to a SessionBackend, which both
+modules import from here at load time without going through each other.
+"""
+
+import asyncio
+from typing import Dict, Any, Callable, Optional, Protocol, Tuple
+from fastmcp import Context
+
+# Fallback in-memory storage when FastMCP Context doesn't expose
+# get/set/remove_session_state (older FastMCP versions).
+# Structure: { (session_id, key): value }, so each access is a single lookup.
+fallback_store: Dict[Tuple[str, str], Any] = {}
+
+
+def has_native_session(ctx: Optional[Context]) -> bool:
+    """Check if the context supports FastMCP's native session state API.
+    
+    session_backend caches its result per context as part of the backend, so
+    the probe itself is not memoized.
+    """
+    return bool(
+        ctx
+        and hasattr(ctx, "set_session_state")
+        and hasattr(ctx, "get_session_state")
+        and hasattr(ctx, "remove_session_state")
+    )
+
+
+# Instance attribute used to cache the session backend bound to a context
+_SESSION_BACKEND_ATTR = "_tfc_session_backend"
+
+
+class SessionBackend(Protocol):
+    """Per-session key/value storage used by the session helpers."""
+
+    session_id: str
+
+    async def get(self, key: str) -> Any: ...
+
+    async def set(self, key: str, value: Any) -> None: ...
+
+    async def remove(self, key: str) -> None: ...
+
+    async def get_many(self, keys: Tuple[str, ...]) -> Dict[str, Any]: ...
+
+    async def remove_many(self, keys: Tuple[str, ...]) -> None: ...
+
+
+class NativeSessionBackend:
+    """Backend storing values through FastMCP's native session state API."""
+
+    __slots__ = ("_ctx", "session_id")
+
+    def __init__(self, ctx: Context, session_id: str):
+        self._ctx = ctx
+        self.session_id = session_id
+
+    async def get(self, key: str) -> Any:
+        return await self._ctx.get_session_state(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._ctx.set_session_state(key, value)
+
+    async def remove(self, key: str) -> None:
+        await self._ctx.remove_session_state(key)
+
+    async def get_many(self, keys: Tuple[str, ...]) -> Dict[str, Any]:
+        # Reads are independent, so a remote session store sees them concurrently
+        values = await asyncio.gather(*(self._ctx.get_session_state(key) for key in keys))
+        return dict(zip(keys, values))
+
+    async def remove_many(self, keys: Tuple[str, ...]) -> None:
+        await asyncio.gather(*(self._ctx.remove_session_state(key) for key in keys))
+
+
+class FallbackSessionBackend:
+    """Backend storing values in the in-memory fallback store."""
+
+    __slots__ = ("session_id",)
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+
+    async def get(self, key: str) -> Any:
+        return fallback_store.get((self.session_id, key))
+
+    async def set(self, key: str, value: Any) -> None:
+        fallback_store[(self.session_id, key)] = value
+
+    async def remove(self, key: str) -> None:
+        fallback_store.pop((self.session_id, key), None)
+
+    async def get_many(self, keys: Tuple[str, ...]) -> Dict[str, Any]:
+        session_id = self.session_id
+        return {key: fallback_store.get((session_id, key)) for key in keys}
+
+    async def remove_many(self, keys: Tuple[str, ...]) -> None:
+        session_id = self.session_id
+        for key in keys:
+            fallback_store.pop((session_id, key), None)
+
+
+def session_backend(ctx: Context, resolve_session_id: Callable[[Context], str]) -> SessionBackend:
+    """Get the session backend for a context.
+    
+    The native/fallback choice and the session ID are resolved once per
+    context and cached in its instance dict as the backend, so later session
+    operations in the same request skip both the capability probe and the
+    session ID lookup.
+    
+    Args:
+        ctx: FastMCP Context object
+        resolve_session_id: Called on a cache miss to get the context's session ID
+        
+    Returns:
+        Backend bound to the context's session
+    """
+    ctx_dict = getattr(ctx, "__dict__", None)
+    if ctx_dict is not None:
+        cached = ctx_dict.get(_SESSION_BACKEND_ATTR)
+        if cached is not None:
+            return cached
+    
+    session_id = resolve_session_id(ctx)
+    backend: SessionBackend
+    if has_native_session(ctx):
+        backend = NativeSessionBackend(ctx, session_id)
+    else:
+        backend = FallbackSessionBackend(session_id)
+    if ctx_dict is not None:
+        ctx_dict[_SESSION_BACKEND_ATTR] = backend
+    return backend
@@ -11,29 +11,150 @@ Headers processed:
 - X-Client-Preferences: User preferences as JSON string
 """
 
+import copy
 import json
 import logging
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Callable, Tuple
 from fastmcp import Context
 
+# orjson is optional (the "fast" extra); when installed it parses
+# X-Client-Preferences several times faster. Its JSONDecodeError subclasses
+# json.JSONDecodeError, so the same except clause covers both parsers.
+try:
+    import orjson
+
+    _json_loads: Callable[[str], Any] = orjson.loads
+except ImportError:  # pragma: no cover - depends on the environment
+    _json_loads = json.loads
+
+# fastnumbers is optional too; fast_float returns its input unchanged instead
+# of raising when the value is not a number, so invalid timestamps skip the
+# exception machinery entirely.
+try:
+    from fastnumbers import fast_float as _fast_float
+except ImportError:  # pragma: no cover - depends on the environment
+    _fast_float = None
+
+# session imports this module too; the cycle is safe because session's
+# attributes are only looked up at call time, never during import
+from . import session
+from ._session_core import SessionBackend, session_backend
+
 logger = logging.getLogger(__name__)
 
-# Session state keys for client context
+# Instance attribute memoizing the client context read for the current request
+_CLIENT_CONTEXT_CACHE = "_tfc_client_context"
+
+# Session state keys for client context. Only SESSION_KEY_CLIENT_CONTEXT is
+# written; the per-field keys are kept for clearing data from older versions.
 SESSION_KEY_CLIENT_CONTEXT = "client_context"
 SESSION_KEY_CLIENT_REGION = "client_region"
 SESSION_KEY_CLIENT_AGENT = "client_agent"
 SESSION_KEY_CLIENT_TIMESTAMP = "client_timestamp"
 SESSION_KEY_CLIENT_PREFERENCES = "client_preferences"
 
+def _parse_timestamp(header_value: str) -> Optional[float]:
+    """Parse the X-Client-Timestamp header, or return None if invalid."""
+    if _fast_float is not None:
+        timestamp = _fast_float(header_value)
+        if isinstance(timestamp, float):
+            return timestamp
+        logger.warning("[Client Context] Invalid timestamp value '%s'", header_value)
+        return None
+    try:
+        return float(header_value)
+    except (ValueError, TypeError) as e:
+        logger.warning("[Client Context] Invalid timestamp value '%s': %s", header_value, e)
+        return None
+
 
-def _has_native_session(ctx: Optional[Context]) -> bool:
-    """Check if the context supports FastMCP's native session state API."""
-    return bool(
-        ctx
-        and hasattr(ctx, "set_session_state")
-        and hasattr(ctx, "get_session_state")
-        and hasattr(ctx, "remove_session_state")
-    )
+@lru_cache(maxsize=256)
+def _load_preferences_json(header_value: str) -> Any:
+    """Decode a preferences header value, memoized by its exact string.
+    
+    A client sends the same preferences on every request, so repeat values
+    skip the JSON decode. Decode errors propagate and are not cached.
+    """
+    return _json_loads(header_value)
+
+
+def _parse_preferences(header_value: str) -> Optional[Dict[str, Any]]:
+    """Parse the X-Client-Preferences JSON header, or return None if invalid."""
+    try:
+        preferences = _load_preferences_json(header_value)
+    except json.JSONDecodeError as e:
+        logger.warning("[Client Context] Invalid JSON in preferences: %s", e)
+        return None
+    if not isinstance(preferences, dict):
+        logger.warning("[Client Context] Preferences is not a dict: %s", type(preferences))
+        return None
+    # Copy so a request's context never aliases the memoized value. JSON
+    # containers are the only mutable values, so flat preferences (the usual
+    # case) need just a shallow copy.
+    if any(isinstance(value, (dict, list)) for value in preferences.values()):
+        return copy.deepcopy(preferences)
+    return dict(preferences)
+
+
+# Client context headers as (lowercased header name, context field, canonical
+# header name, parser) rows; headers without a parser are stored as-is. A
+# frozen tuple is all the extractor needs, since it only ever iterates it.
+_CLIENT_HEADERS: Tuple[Tuple[str, str, str, Optional[Callable[[str], Any]]], ...] = (
+    ('x-client-region', 'region', 'X-Client-Region', None),
+    ('x-client-agent', 'agent_name', 'X-Client-Agent', None),
+    ('x-client-timestamp', 'timestamp', 'X-Client-Timestamp', _parse_timestamp),
+    ('x-client-preferences', 'preferences', 'X-Client-Preferences', _parse_preferences),
+)
+_CLIENT_HEADER_KEYS = frozenset(row[0] for row in _CLIENT_HEADERS)
+
+# Every key clear_client_context removes, including the legacy per-field keys
+_CLIENT_CONTEXT_KEYS = (
+    SESSION_KEY_CLIENT_CONTEXT,
+    SESSION_KEY_CLIENT_REGION,
+    SESSION_KEY_CLIENT_AGENT,
+    SESSION_KEY_CLIENT_TIMESTAMP,
+    SESSION_KEY_CLIENT_PREFERENCES,
+)
+
+
+def lowercase_headers(request: Any) -> Dict[str, str]:
+    """Get the request headers as a dict keyed by lowercased header name.
+    
+    The map is built once per request and cached on the request object, so
+    session ID lookup and client context extraction share a single pass over
+    the headers. Headers with empty values are skipped and the first
+    non-empty value for a repeated header wins.
+    
+    Args:
+        request: HTTP request object exposing a headers mapping
+        
+    Returns:
+        Dictionary of lowercased header names to str header values
+    """
+    cached = getattr(request, '_tfc_lowercase_headers', None)
+    if cached is not None:
+        return cached
+    
+    headers: Dict[str, str] = {}
+    raw = getattr(request.headers, 'raw', None)
+    if raw is not None:
+        # Starlette exposes the ASGI byte pairs; bytes.lower() is ASCII-only
+        # (header names are ASCII per RFC 7230) and skips the str round trip
+        for raw_name, raw_value in raw:
+            if raw_value:
+                headers.setdefault(raw_name.lower().decode('latin-1'), raw_value.decode('latin-1'))
+    else:
+        for header_name, header_value in request.headers.items():
+            if header_value:
+                headers.setdefault(header_name.lower(), header_value)
+    
+    try:
+        request._tfc_lowercase_headers = headers
+    except AttributeError:
+        # Request objects that reject new attributes just rebuild the map
+        pass
+    return headers
 
 
 def extract_client_context_from_headers(ctx: Optional[Context]) -> Dict[str, Any]:
@@ -58,124 +179,101 @@ def extract_client_context_from_headers(ctx: Optional[Context]) -> Dict[str, Any
         logger.debug("[Client Context] No context provided, returning empty context")
         return {}
     
-    # Check if we have request context with headers
-    if not (ctx.request_context and hasattr(ctx.request_context, 'request')):
-        logger.debug("[Client Context] No request context available")
+    # Single-lookup guards: a missing request context, request or headers all
+    # resolve to None instead of raising
+    request = getattr(ctx.request_context, 'request', None)
+    if request is None or getattr(request, 'headers', None) is None:
+        logger.debug("[Client Context] No request headers available")
         return {}
     
     try:
-        request = ctx.request_context.request
-        if not (request and hasattr(request, 'headers')):
-            logger.debug("[Client Context] No headers in request")
+        headers = lowercase_headers(request)
+        
+        # Most requests carry no X-Client-* headers. The header map is already
+        # built and cached for the session ID lookup, so checking it against the
+        # four known names is cheaper than rescanning the raw names for an
+        # 'x-client-' prefix, and it skips the extraction loop entirely.
+        if _CLIENT_HEADER_KEYS.isdisjoint(headers):
+            logger.debug("[Client Context] No client context headers found in request")
             return {}
         
-        headers = dict(request.headers)
-        logger.debug(f"[Client Context] All received headers: {list(headers.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[Client Context] All received headers: %s", list(headers))
         
         client_context: Dict[str, Any] = {}
         raw_headers: Dict[str, str] = {}
         
-        # Extract X-Client-Region
-        for header_name, header_value in headers.items():
-            if header_name.lower() == 'x-client-region' and header_value:
-                region = str(header_value)
-                client_context['region'] = region
-                raw_headers['X-Client-Region'] = region
-                logger.info(f"[Client Context] Extracted region: '{region}'")
-                break
-        
-        # Extract X-Client-Agent
-        for header_name, header_value in headers.items():
-            if header_name.lower() == 'x-client-agent' and header_value:
-                agent_name = str(header_value)
-                client_context['agent_name'] = agent_name
-                raw_headers['X-Client-Agent'] = agent_name
-                logger.info(f"[Client Context] Extracted agent: '{agent_name}'")
-                break
-        
-        # Extract X-Client-Timestamp
-        for header_name, header_value in headers.items():
-            if header_name.lower() == 'x-client-timestamp' and header_value:
-                try:
-                    timestamp = float(header_value)
-                    client_context['timestamp'] = timestamp
-                    raw_headers['X-Client-Timestamp'] = header_value
-                    logger.info(f"[Client Context] Extracted timestamp: {timestamp}")
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"[Client Context] Invalid timestamp value '{header_value}': {e}")
-                break
-        
-        # Extract X-Client-Preferences
-        for header_name, header_value in headers.items():
-            if header_name.lower() == 'x-client-preferences' and header_value:
-                try:
-                    preferences = json.loads(str(header_value))
-                    if isinstance(preferences, dict):
-                        client_context['preferences'] = preferences
-                        raw_headers['X-Client-Preferences'] = str(header_value)
-                        logger.info(f"[Client Context] Extracted preferences: {preferences}")
-                    else:
-                        logger.warning(f"[Client Context] Preferences is not a dict: {type(preferences)}")
-                except json.JSONDecodeError as e:
-                    logger.warning(f"[Client Context] Invalid JSON in preferences: {e}")
-                break
+        for lowercase_name, field, canonical_name, parse in _CLIENT_HEADERS:
+            header_value = headers.get(lowercase_name)
+            if not header_value:
+                continue
+            
+            value = header_value if parse is None else parse(header_value)
+            if value is None:
+                continue
+            client_context[field] = value
+            raw_headers[canonical_name] = header_value
+            logger.info("[Client Context] Extracted %s: %r", field, value)
         
         # Store raw headers for debugging if any client context was found
         if raw_headers:
             client_context['raw_headers'] = raw_headers
-            logger.debug(f"[Client Context] Complete extracted context: {client_context}")
-        elif headers:
-            logger.debug("[Client Context] No client context headers found in request")
+            logger.debug("[Client Context] Complete extracted context: %s", client_context)
+        else:
+            logger.debug("[Client Context] Client context headers present but none had a valid value")
         
         return client_context
         
     except Exception as e:
-        logger.error(f"[Client Context] Failed to extract client context: {e}")
+        logger.error("[Client Context] Failed to extract client context: %s", e)
         return {}
 
 
-def _get_session_id_from_context(ctx: Optional[Context]) -> str:
-    """Safely get session ID from context.
+def _get_cached_client_context(ctx: Context) -> Optional[Dict[str, Any]]:
+    """Get the client context memoized on this context, if any."""
+    ctx_dict = getattr(ctx, "__dict__", None)
+    if ctx_dict is None:
+        return None
+    return ctx_dict.get(_CLIENT_CONTEXT_CACHE)
+
+
+def _set_cached_client_context(ctx: Context, client_context: Optional[Dict[str, Any]]) -> None:
+    """Memoize the client context on this context, or drop it when None.
+    
+    FastMCP contexts are unhashable, so the value lives in the context's
+    instance dict rather than a WeakKeyDictionary; it goes away with the
+    context at the end of the request.
+    """
+    ctx_dict = getattr(ctx, "__dict__", None)
+    if ctx_dict is None:
+        return
+    if client_context is None:
+        ctx_dict.pop(_CLIENT_CONTEXT_CACHE, None)
+    else:
+        ctx_dict[_CLIENT_CONTEXT_CACHE] = client_context
+
+
+def _get_backend(ctx: Context) -> SessionBackend:
+    """Get the session backend for a context.
     
-    This is a helper function that extracts the session ID using the same
-    logic as the main session management module. It's used internally
-    when we need the session ID for storage operations.
+    The session ID is resolved with the same logic as the main session
+    management module, once per context.
     
     Args:
         ctx: FastMCP Context object
         
     Returns:
-        Session ID string or 'default' for stdio mode
+        Backend bound to the context's session
     """
-    if not ctx:
-        return 'default'
-    
-    # Import here to avoid circular dependency
-    from .session import get_session_id_safe
-    return get_session_id_safe(ctx)
-
-
-def _fb_set(session_id: str, key: str, value: Any) -> None:
-    """Set value in fallback in-memory storage."""
-    # Import here to avoid circular dependency
-    from .session import _fallback_store as fb_store
-    bucket = fb_store.setdefault(session_id, {})
-    bucket[key] = value
-
-
-def _fb_get(session_id: str, key: str) -> Any:
-    """Get value from fallback in-memory storage."""
-    # Import here to avoid circular dependency
-    from .session import _fallback_store as fb_store
-    bucket = fb_store.get(session_id, {})
-    return bucket.get(key)
+    return session_backend(ctx, session.get_session_id_safe)
 
 
 async def store_client_context(ctx: Optional[Context], client_context: Dict[str, Any]) -> None:
     """Store client context in session state.
     
-    Stores the complete client context dictionary and individual fields
-    in session state for easy retrieval later.
+    The complete client context dictionary is stored under a single session
+    key, so storing costs one session-state write. Individual fields are
+    read back from it by the get_client_* helpers.
     
     Args:
         ctx: FastMCP Context object
@@ -185,50 +283,16 @@ async def store_client_context(ctx: Optional[Context], client_context: Dict[str,
         logger.debug("[Client Context] No context or client_context provided, nothing to store")
         return
     
-    session_id = _get_session_id_from_context(ctx)
-    logger.info(f"[Client Context] Storing context for session '{session_id}'")
-    
-    # Store complete client context
-    if _has_native_session(ctx):
-        await ctx.set_session_state(SESSION_KEY_CLIENT_CONTEXT, client_context)
-    else:
-        _fb_set(session_id, SESSION_KEY_CLIENT_CONTEXT, client_context)
-    logger.debug(f"[Client Context] Stored complete context: {list(client_context.keys())}")
-    
-    # Store individual fields for easy access
-    if 'region' in client_context:
-        region = client_context['region']
-        if _has_native_session(ctx):
-            await ctx.set_session_state(SESSION_KEY_CLIENT_REGION, region)
-        else:
-            _fb_set(session_id, SESSION_KEY_CLIENT_REGION, region)
-        logger.debug(f"[Client Context] Stored region: '{region}'")
-    
-    if 'agent_name' in client_context:
-        agent_name = client_context['agent_name']
-        if _has_native_session(ctx):
-            await ctx.set_session_state(SESSION_KEY_CLIENT_AGENT, agent_name)
-        else:
-            _fb_set(session_id, SESSION_KEY_CLIENT_AGENT, agent_name)
-        logger.debug(f"[Client Context] Stored agent: '{agent_name}'")
-    
-    if 'timestamp' in client_context:
-        timestamp = client_context['timestamp']
-        if _has_native_session(ctx):
-            await ctx.set_session_state(SESSION_KEY_CLIENT_TIMESTAMP, timestamp)
-        else:
-            _fb_set(session_id, SESSION_KEY_CLIENT_TIMESTAMP, timestamp)
-        logger.debug(f"[Client Context] Stored timestamp: {timestamp}")
+    backend = _get_backend(ctx)
+    session_id = backend.session_id
+    logger.info("[Client Context] Storing context for session '%s'", session_id)
     
-    if 'preferences' in client_context:
-        preferences = client_context['preferences']
-        if _has_native_session(ctx):
-            await ctx.set_session_state(SESSION_KEY_CLIENT_PREFERENCES, preferences)
-        else:
-            _fb_set(session_id, SESSION_KEY_CLIENT_PREFERENCES, preferences)
-        logger.debug(f"[Client Context] Stored preferences: {preferences}")
+    await backend.set(SESSION_KEY_CLIENT_CONTEXT, client_context)
+    _set_cached_client_context(ctx, client_context)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[Client Context] Stored complete context: %s", list(client_context))
     
-    logger.info(f"[Client Context] Successfully stored context for session '{session_id}'")
+    logger.info("[Client Context] Successfully stored context for session '%s'", session_id)
 
 
 async def get_client_context(ctx: Optional[Context]) -> Dict[str, Any]:
@@ -244,42 +308,57 @@ async def get_client_context(ctx: Optional[Context]) -> Dict[str, Any]:
         logger.debug("[Client Context] No context provided, returning empty context")
         return {}
     
-    session_id = _get_session_id_from_context(ctx)
+    # Later reads in the same request reuse the first result
+    cached = _get_cached_client_context(ctx)
+    if cached is not None:
+        return cached
     
-    if _has_native_session(ctx):
-        client_context = await ctx.get_session_state(SESSION_KEY_CLIENT_CONTEXT)
-    else:
-        client_context = _fb_get(session_id, SESSION_KEY_CLIENT_CONTEXT)
+    backend = _get_backend(ctx)
+    session_id = backend.session_id
+    
+    client_context = await backend.get(SESSION_KEY_CLIENT_CONTEXT)
     
     if client_context:
-        logger.debug(f"[Client Context] Retrieved context for session '{session_id}'")
-        return client_context
+        logger.debug("[Client Context] Retrieved context for session '%s'", session_id)
     else:
-        logger.debug(f"[Client Context] No context found for session '{session_id}'")
-        return {}
+        logger.debug("[Client Context] No context found for session '%s'", session_id)
+        client_context = {}
+    
+    _set_cached_client_context(ctx, client_context)
+    return client_context
 
 
-async def get_client_region(ctx: Optional[Context]) -> Optional[str]:
-    """Get the client region from session state.
+async def get_client_fields(ctx: Optional[Context], *fields: str) -> Tuple[Any, ...]:
+    """Get several client context fields with a single session-state read.
     
     Args:
         ctx: FastMCP Context object
+        *fields: Client context field names, e.g. 'region', 'agent_name'
         
     Returns:
-        AWS region string or None if not found
+        Tuple with the value of each requested field, in order, or None for
+        fields that are not set
     """
     if not ctx:
-        return None
+        return (None,) * len(fields)
     
-    session_id = _get_session_id_from_context(ctx)
+    stored = await get_client_context(ctx)
+    return tuple(stored.get(field) for field in fields)
+
+
+async def get_client_region(ctx: Optional[Context]) -> Optional[str]:
+    """Get the client region from session state.
     
-    if _has_native_session(ctx):
-        region = await ctx.get_session_state(SESSION_KEY_CLIENT_REGION)
-    else:
-        region = _fb_get(session_id, SESSION_KEY_CLIENT_REGION)
+    Args:
+        ctx: FastMCP Context object
+        
+    Returns:
+        AWS region string or None if not found
+    """
+    region = (await get_client_fields(ctx, 'region'))[0]
     
     if region:
-        logger.debug(f"[Client Context] Retrieved region: '{region}'")
+        logger.debug("[Client Context] Retrieved region: '%s'", region)
     
     return region
 
@@ -293,18 +372,10 @@ async def get_client_agent(ctx: Optional[Context]) -> Optional[str]:
     Returns:
         Agent name string or None if not found
     """
-    if not ctx:
-        return None
-    
-    session_id = _get_session_id_from_context(ctx)
-    
-    if _has_native_session(ctx):
-        agent = await ctx.get_session_state(SESSION_KEY_CLIENT_AGENT)
-    else:
-        agent = _fb_get(session_id, SESSION_KEY_CLIENT_AGENT)
+    agent = (await get_client_fields(ctx, 'agent_name'))[0]
     
     if agent:
-        logger.debug(f"[Client Context] Retrieved agent: '{agent}'")
+        logger.debug("[Client Context] Retrieved agent: '%s'", agent)
     
     return agent
 
@@ -318,18 +389,10 @@ async def get_client_timestamp(ctx: Optional[Context]) -> Optional[float]:
     Returns:
         Unix timestamp float or None if not found
     """
-    if not ctx:
-        return None
-    
-    session_id = _get_session_id_from_context(ctx)
-    
-    if _has_native_session(ctx):
-        timestamp = await ctx.get_session_state(SESSION_KEY_CLIENT_TIMESTAMP)
-    else:
-        timestamp = _fb_get(session_id, SESSION_KEY_CLIENT_TIMESTAMP)
+    timestamp = (await get_client_fields(ctx, 'timestamp'))[0]
     
     if timestamp is not None:
-        logger.debug(f"[Client Context] Retrieved timestamp: {timestamp}")
+        logger.debug("[Client Context] Retrieved timestamp: %s", timestamp)
     
     return timestamp
 
@@ -343,18 +406,10 @@ async def get_client_preferences(ctx: Optional[Context]) -> Dict[str, Any]:
     Returns:
         Dictionary of preferences or empty dict if not found
     """
-    if not ctx:
-        return {}
-    
-    session_id = _get_session_id_from_context(ctx)
-    
-    if _has_native_session(ctx):
-        preferences = await ctx.get_session_state(SESSION_KEY_CLIENT_PREFERENCES)
-    else:
-        preferences = _fb_get(session_id, SESSION_KEY_CLIENT_PREFERENCES)
+    preferences = (await get_client_fields(ctx, 'preferences'))[0]
     
     if preferences:
-        logger.debug(f"[Client Context] Retrieved preferences: {preferences}")
+        logger.debug("[Client Context] Retrieved preferences: %s", preferences)
         return preferences
     else:
         return {}
@@ -370,22 +425,13 @@ async def clear_client_context(ctx: Optional[Context]) -> None:
         logger.debug("[Client Context] No context provided, nothing to clear")
         return
     
-    session_id = _get_session_id_from_context(ctx)
-    logger.info(f"[Client Context] Clearing context for session '{session_id}'")
+    backend = _get_backend(ctx)
+    session_id = backend.session_id
+    logger.info("[Client Context] Clearing context for session '%s'", session_id)
+    _set_cached_client_context(ctx, None)
     
-    if _has_native_session(ctx):
-        await ctx.remove_session_state(SESSION_KEY_CLIENT_CONTEXT)
-        await ctx.remove_session_state(SESSION_KEY_CLIENT_REGION)
-        await ctx.remove_session_state(SESSION_KEY_CLIENT_AGENT)
-        await ctx.remove_session_state(SESSION_KEY_CLIENT_TIMESTAMP)
-        await ctx.remove_session_state(SESSION_KEY_CLIENT_PREFERENCES)
-    else:
-        # Import here to avoid circular dependency
-        from .session import _fb_remove
-        _fb_remove(session_id, SESSION_KEY_CLIENT_CONTEXT)
-        _fb_remove(session_id, SESSION_KEY_CLIENT_REGION)
-        _fb_remove(session_id, SESSION_KEY_CLIENT_AGENT)
-        _fb_remove(session_id, SESSION_KEY_CLIENT_TIMESTAMP)
-        _fb_remove(session_id, SESSION_KEY_CLIENT_PREFERENCES)
-    
-    logger.info(f"[Client Context] Cleared context for session '{session_id}'")
+    # Per-field keys are no longer written but are still removed, so sessions
+    # stored by older versions are fully cleared; the removals run as one batch
+    await backend.remove_many(_CLIENT_CONTEXT_KEYS)
+    
+    logger.info("[Client Context] Cleared context for session '%s'", session_id)
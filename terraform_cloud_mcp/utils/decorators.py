@@ -1,7 +1,7 @@
 """Decorators and utility functions for Terraform Cloud MCP"""
 
 from functools import wraps
-from typing import Callable, Any, Dict, Awaitable, cast
+from typing import Callable, Any, Dict, Awaitable
 
 
 def handle_api_errors(
@@ -11,10 +11,9 @@ def handle_api_errors(
 
     @wraps(func)
     async def wrapper(*args, **kwargs) -> Dict[str, Any]:
+        # Success path returns the awaited result directly, with no extra calls
         try:
-            result = await func(*args, **kwargs)
-            # Cast ensures type safety when func might return subclass of Dict
-            return cast(Dict[str, Any], result)
+            return await func(*args, **kwargs)
         except ValueError as e:
             return {"error": str(e)}
 
@@ -7,10 +7,25 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+_TRUTHY_VALUES = frozenset(("true", "1", "yes", "on"))
+
+
+def _env_flag(name: str) -> bool:
+    """Parse a boolean environment variable, defaulting to false."""
+    return os.getenv(name, "false").lower().strip() in _TRUTHY_VALUES
+
+
+# Server configuration is fixed for the lifetime of the process, so parse it once
+_TFC_TOKEN = os.getenv("TFC_TOKEN")
+_TFC_ADDRESS = os.getenv("TFC_ADDRESS", "https://app.terraform.io")
+_ENABLE_DELETE_TOOLS = _env_flag("ENABLE_DELETE_TOOLS")
+_ENABLE_RAW_RESPONSE = _env_flag("ENABLE_RAW_RESPONSE")
+_READ_ONLY_TOOLS = _env_flag("READ_ONLY_TOOLS")
+
 
 def get_tfc_token() -> Optional[str]:
     """Get Terraform Cloud API token from environment."""
-    return os.getenv("TFC_TOKEN")
+    return _TFC_TOKEN
 
 
 async def get_active_token(ctx: Optional[Context] = None) -> str:
@@ -55,22 +70,19 @@ async def get_active_token(ctx: Optional[Context] = None) -> str:
 
 def get_tfc_address() -> str:
     """Get Terraform Cloud/Enterprise address from environment, with default of app.terraform.io."""
-    return os.getenv("TFC_ADDRESS", "https://app.terraform.io")
+    return _TFC_ADDRESS
 
 
 def should_enable_delete_tools() -> bool:
     """Check if delete tools should be enabled."""
-    env_value = os.getenv("ENABLE_DELETE_TOOLS", "false").lower().strip()
-    return env_value in ("true", "1", "yes", "on")
+    return _ENABLE_DELETE_TOOLS
 
 
 def should_return_raw_response() -> bool:
     """Check if raw API responses should be returned instead of filtered responses."""
-    env_value = os.getenv("ENABLE_RAW_RESPONSE", "false").lower().strip()
-    return env_value in ("true", "1", "yes", "on")
+    return _ENABLE_RAW_RESPONSE
 
 
 def should_enable_read_only_tools() -> bool:
     """Check if only read-only tools should be enabled."""
-    env_value = os.getenv("READ_ONLY_TOOLS", "false").lower().strip()
-    return env_value in ("true", "1", "yes", "on")
+    return _READ_ONLY_TOOLS
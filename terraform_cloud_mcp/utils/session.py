@@ -11,53 +11,95 @@ with support for distributed deployments via custom storage backends.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Set
 from fastmcp import Context
 import asyncio
 
 # Import client context utilities
 from . import client_context
+from ._session_core import SessionBackend, session_backend
 
 logger = logging.getLogger(__name__)
 
 # Session state keys
 SESSION_KEY_TOKEN = "tfc_token"
+# Organization, workspace and project are stored together in one dict, so the
+# whole context is read, written or cleared in a single session-state call
+SESSION_KEY_CONTEXT = "current_context"
+SESSION_KEY_PREFERENCES = "preferences"
+SESSION_KEY_CLIENT_CONTEXT = "client_context"
+# Per-field context keys are no longer written but are kept for clearing
+# data from older versions
 SESSION_KEY_ORGANIZATION = "current_organization"
 SESSION_KEY_WORKSPACE = "current_workspace"
 SESSION_KEY_PROJECT = "current_project"
-SESSION_KEY_PREFERENCES = "preferences"
-SESSION_KEY_CLIENT_CONTEXT = "client_context"
-SESSION_KEY_CLIENT_REGION = "client_region"
-SESSION_KEY_CLIENT_AGENT = "client_agent"
-SESSION_KEY_CLIENT_TIMESTAMP = "client_timestamp"
-SESSION_KEY_CLIENT_PREFERENCES = "client_preferences"
-
-# Fallback in-memory storage when FastMCP Context doesn't expose
-# get/set/remove_session_state (older FastMCP versions).
-# Structure: { session_id: { key: value } }
-_fallback_store: Dict[str, Dict[str, Any]] = {}
-
-def _has_native_session(ctx: Optional[Context]) -> bool:
-    return bool(
-        ctx
-        and hasattr(ctx, "set_session_state")
-        and hasattr(ctx, "get_session_state")
-        and hasattr(ctx, "remove_session_state")
-    )
-
-def _fb_set(session_id: str, key: str, value: Any) -> None:
-    bucket = _fallback_store.setdefault(session_id, {})
-    bucket[key] = value
-
-def _fb_get(session_id: str, key: str) -> Any:
-    bucket = _fallback_store.get(session_id, {})
-    return bucket.get(key)
-
-def _fb_remove(session_id: str, key: str) -> None:
-    bucket = _fallback_store.get(session_id)
-    if not bucket:
-        return
-    bucket.pop(key, None)
+
+# Every key clear_session_context removes, including the legacy per-field keys
+_CONTEXT_KEYS = (
+    SESSION_KEY_CONTEXT,
+    SESSION_KEY_ORGANIZATION,
+    SESSION_KEY_WORKSPACE,
+    SESSION_KEY_PROJECT,
+)
+
+# Keys read together by get_session_info
+_SESSION_INFO_KEYS = (
+    SESSION_KEY_TOKEN,
+    SESSION_KEY_CONTEXT,
+    SESSION_KEY_PREFERENCES,
+    SESSION_KEY_CLIENT_CONTEXT,
+)
+
+# Locks serializing read-modify-write updates of dict-valued session keys,
+# striped by (session_id, key) so the set stays fixed however many sessions
+# come and go
+_MERGE_LOCK_STRIPES = 16
+_merge_locks: Tuple[asyncio.Lock, ...] = tuple(asyncio.Lock() for _ in range(_MERGE_LOCK_STRIPES))
+
+# Request attribute caching the session ID resolved from its headers
+_REQUEST_SESSION_ID_ATTR = "_tfc_session_id"
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected
+# before completing
+_background_tasks: Set["asyncio.Task[None]"] = set()
+
+# Tokens at or below this length are fully masked
+_MASK_MIN_LENGTH = 12
+_MASK_ELLIPSIS = "..."
+
+def _backend(ctx: Context) -> SessionBackend:
+    """Get the session backend bound to this context's session."""
+    return session_backend(ctx, get_session_id_safe)
+
+def _merge_lock(backend: SessionBackend, key: str) -> asyncio.Lock:
+    """Get the lock striped to one session key."""
+    return _merge_locks[hash((backend.session_id, key)) % _MERGE_LOCK_STRIPES]
+
+async def _merge_state(backend: SessionBackend, key: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge values into a dict-valued session key with one read and one write.
+    
+    The stored dict is copied rather than mutated in place, and concurrent
+    merges into the same session key are serialized so none of them is lost.
+    """
+    async with _merge_lock(backend, key):
+        stored = await backend.get(key) or {}
+        updated = {**stored, **values}
+        await backend.set(key, updated)
+    return updated
+
+
+def mask_token(token: str) -> str:
+    """Mask a token for logging, keeping only its first 8 and last 4 characters.
+    
+    Args:
+        token: The token to mask
+        
+    Returns:
+        Masked token string, or '***' for short tokens
+    """
+    if len(token) <= _MASK_MIN_LENGTH:
+        return "***"
+    return token[:8] + _MASK_ELLIPSIS + token[-4:]
 
 
 def get_session_id_safe(ctx: Optional[Context]) -> str:
@@ -82,35 +124,50 @@ def get_session_id_safe(ctx: Optional[Context]) -> str:
         return 'default'
     
     # Primary: Extract x-session-id from HTTP request headers
-    if ctx.request_context and hasattr(ctx.request_context, 'request'):
+    request = getattr(ctx.request_context, 'request', None)
+    if request is not None and getattr(request, 'headers', None) is not None:
         try:
-            request = ctx.request_context.request
-            if request and hasattr(request, 'headers'):
-                headers = dict(request.headers)
-                logger.info(f"[Session ID DEBUG] All received headers: {headers}")
-                # Find x-session-id header (case-insensitive)
-                for header_name, header_value in headers.items():
-                    if header_name.lower() == 'x-session-id' and header_value:
-                        session_id = str(header_value)
-                        logger.info(f"[Session ID] Using x-session-id header: '{session_id}'")
-                        
-                        # Extract and store client context from headers (fire and forget)
-                        client_ctx = client_context.extract_client_context_from_headers(ctx)
-                        if client_ctx:
-                            logger.info(f"[Session ID] Client context found, storing for session '{session_id}'")
-                            # Fire and forget - don't block session ID extraction
-                            _ = asyncio.create_task(client_context.store_client_context(ctx, client_ctx))
-                        else:
-                            logger.info(f"[Session ID] No client context headers found for session '{session_id}'")
-                        
-                        return session_id
+            # Already resolved for this request: skip the header scan and
+            # the client context extraction/store entirely
+            cached_session_id = getattr(request, _REQUEST_SESSION_ID_ATTR, None)
+            if cached_session_id:
+                return cached_session_id
+            
+            # Lowercased header map, shared with client context extraction
+            headers = client_context.lowercase_headers(request)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[Session ID] Received header names: %s", list(headers))
+            session_id = headers.get('x-session-id')
+            if session_id:
+                logger.info("[Session ID] Using x-session-id header: '%s'", session_id)
+                
+                # Remember the ID before storing client context, whose own
+                # session lookup then hits this cache instead of re-scheduling
+                try:
+                    setattr(request, _REQUEST_SESSION_ID_ATTR, session_id)
+                except AttributeError:
+                    pass
+                
+                # Extract and store client context from headers (fire and forget)
+                client_ctx = client_context.extract_client_context_from_headers(ctx)
+                if client_ctx:
+                    logger.info("[Session ID] Client context found, storing for session '%s'", session_id)
+                    # Fire and forget - don't block session ID extraction
+                    task = asyncio.create_task(client_context.store_client_context(ctx, client_ctx))
+                    _background_tasks.add(task)
+                    task.add_done_callback(_background_tasks.discard)
+                else:
+                    logger.info("[Session ID] No client context headers found for session '%s'", session_id)
+                
+                return session_id
         except Exception as e:
-            logger.warning(f"[Session ID] Failed to get HTTP request: {e}")
+            logger.warning("[Session ID] Failed to get HTTP request: %s", e)
     
     # Fallback: Check if ctx.session_id exists (for older FastMCP versions)
-    if hasattr(ctx, 'session_id') and ctx.session_id:
-        logger.info(f"[Session ID] Using ctx.session_id as fallback: '{ctx.session_id}'")
-        return str(ctx.session_id)
+    ctx_session_id = getattr(ctx, 'session_id', None)
+    if ctx_session_id:
+        logger.info("[Session ID] Using ctx.session_id as fallback: '%s'", ctx_session_id)
+        return ctx_session_id if isinstance(ctx_session_id, str) else str(ctx_session_id)
     
     # Check transport type
     transport = getattr(ctx, 'transport', None)
@@ -121,7 +178,7 @@ def get_session_id_safe(ctx: Optional[Context]) -> str:
             f"Missing required x-session-id header in {transport} mode. "
             f"Ensure your HTTP client sends the 'x-session-id' header for session isolation."
         )
-        logger.error(f"[Session ID] {error_msg}")
+        logger.error("[Session ID] %s", error_msg)
         raise ValueError(error_msg)
     
     # Stdio mode: use default session
@@ -149,14 +206,12 @@ async def set_session_token(token: str, ctx: Optional[Context] = None) -> None:
         logger.warning("[Set Token] No context provided, token not stored")
         return
     
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        await ctx.set_session_state(SESSION_KEY_TOKEN, token)
-    else:
-        _fb_set(session_id, SESSION_KEY_TOKEN, token)
+    backend = _backend(ctx)
+    session_id = backend.session_id
+    await backend.set(SESSION_KEY_TOKEN, token)
     
-    masked = f"{token[:8]}...{token[-4:]}" if len(token) > 12 else "***"
-    logger.info(f"[Set Token] Token stored for session '{session_id}' (masked: {masked})")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("[Set Token] Token stored for session '%s' (masked: %s)", session_id, mask_token(token))
 
 
 async def get_session_token(ctx: Optional[Context] = None) -> Optional[str]:
@@ -172,42 +227,58 @@ async def get_session_token(ctx: Optional[Context] = None) -> Optional[str]:
         logger.info("[Get Token] No context provided, returning None")
         return None
     
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        token = await ctx.get_session_state(SESSION_KEY_TOKEN)
-    else:
-        token = _fb_get(session_id, SESSION_KEY_TOKEN)
+    backend = _backend(ctx)
+    session_id = backend.session_id
+    token = await backend.get(SESSION_KEY_TOKEN)
     
     if token:
-        logger.info(f"[Get Token] Retrieved token for session '{session_id}'")
+        logger.info("[Get Token] Retrieved token for session '%s'", session_id)
     else:
-        logger.info(f"[Get Token] No token found for session '{session_id}'")
+        logger.info("[Get Token] No token found for session '%s'", session_id)
     
     return token
 
 
-async def clear_session_token(ctx: Optional[Context] = None) -> None:
+async def clear_session_token(ctx: Optional[Context] = None) -> Optional[str]:
     """Clear the Terraform Cloud API token from session state.
     
     Args:
         ctx: FastMCP Context object
+        
+    Returns:
+        The session ID the token was cleared for, or None if no context
     """
     if not ctx:
         logger.warning("[Clear Token] No context provided")
-        return
+        return None
     
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        await ctx.remove_session_state(SESSION_KEY_TOKEN)
-    else:
-        _fb_remove(session_id, SESSION_KEY_TOKEN)
-    logger.info(f"[Clear Token] Token removed for session '{session_id}'")
+    backend = _backend(ctx)
+    session_id = backend.session_id
+    await backend.remove(SESSION_KEY_TOKEN)
+    logger.info("[Clear Token] Token removed for session '%s'", session_id)
+    return session_id
 
 
 # ============================================================================
 # Context Management (Organization/Workspace/Project)
 # ============================================================================
 
+async def _update_context(ctx: Context, **values: str) -> Dict[str, Optional[str]]:
+    """Merge values into the stored context and return the updated context."""
+    updated = await _merge_state(_backend(ctx), SESSION_KEY_CONTEXT, values)
+    return {
+        "organization": updated.get("organization"),
+        "workspace": updated.get("workspace"),
+        "project": updated.get("project")
+    }
+
+
+async def _get_context_value(ctx: Context, name: str) -> Optional[str]:
+    """Get one field of the stored context."""
+    stored = await _backend(ctx).get(SESSION_KEY_CONTEXT)
+    return stored.get(name) if stored else None
+
+
 async def set_current_organization(organization: str, ctx: Optional[Context] = None) -> None:
     """Set the current organization in session context.
     
@@ -218,12 +289,8 @@ async def set_current_organization(organization: str, ctx: Optional[Context] = N
     if not ctx:
         return
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        await ctx.set_session_state(SESSION_KEY_ORGANIZATION, organization)
-    else:
-        _fb_set(session_id, SESSION_KEY_ORGANIZATION, organization)
-    logger.info(f"[Context] Set current organization to '{organization}'")
+    await _update_context(ctx, organization=organization)
+    logger.info("[Context] Set current organization to '%s'", organization)
 
 
 async def get_current_organization(ctx: Optional[Context] = None) -> Optional[str]:
@@ -235,11 +302,7 @@ async def get_current_organization(ctx: Optional[Context] = None) -> Optional[st
     if not ctx:
         return None
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        return await ctx.get_session_state(SESSION_KEY_ORGANIZATION)
-    else:
-        return _fb_get(session_id, SESSION_KEY_ORGANIZATION)
+    return await _get_context_value(ctx, "organization")
 
 
 async def set_current_workspace(workspace: str, ctx: Optional[Context] = None) -> None:
@@ -252,12 +315,8 @@ async def set_current_workspace(workspace: str, ctx: Optional[Context] = None) -
     if not ctx:
         return
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        await ctx.set_session_state(SESSION_KEY_WORKSPACE, workspace)
-    else:
-        _fb_set(session_id, SESSION_KEY_WORKSPACE, workspace)
-    logger.info(f"[Context] Set current workspace to '{workspace}'")
+    await _update_context(ctx, workspace=workspace)
+    logger.info("[Context] Set current workspace to '%s'", workspace)
 
 
 async def get_current_workspace(ctx: Optional[Context] = None) -> Optional[str]:
@@ -269,11 +328,7 @@ async def get_current_workspace(ctx: Optional[Context] = None) -> Optional[str]:
     if not ctx:
         return None
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        return await ctx.get_session_state(SESSION_KEY_WORKSPACE)
-    else:
-        return _fb_get(session_id, SESSION_KEY_WORKSPACE)
+    return await _get_context_value(ctx, "workspace")
 
 
 async def set_current_project(project: str, ctx: Optional[Context] = None) -> None:
@@ -286,12 +341,8 @@ async def set_current_project(project: str, ctx: Optional[Context] = None) -> No
     if not ctx:
         return
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        await ctx.set_session_state(SESSION_KEY_PROJECT, project)
-    else:
-        _fb_set(session_id, SESSION_KEY_PROJECT, project)
-    logger.info(f"[Context] Set current project to '{project}'")
+    await _update_context(ctx, project=project)
+    logger.info("[Context] Set current project to '%s'", project)
 
 
 async def get_current_project(ctx: Optional[Context] = None) -> Optional[str]:
@@ -303,11 +354,7 @@ async def get_current_project(ctx: Optional[Context] = None) -> Optional[str]:
     if not ctx:
         return None
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        return await ctx.get_session_state(SESSION_KEY_PROJECT)
-    else:
-        return _fb_get(session_id, SESSION_KEY_PROJECT)
+    return await _get_context_value(ctx, "project")
 
 
 async def set_session_context(
@@ -315,24 +362,39 @@ async def set_session_context(
     organization: Optional[str] = None,
     workspace: Optional[str] = None,
     project: Optional[str] = None
-) -> None:
+) -> Dict[str, Optional[str]]:
     """Set multiple context values at once.
     
+    Provided values are merged into the stored context with a single read
+    and write, and the caller gets the updated context back without a
+    separate get_session_context round trip.
+    
     Args:
         ctx: FastMCP Context object
         organization: Organization name/ID to set
         workspace: Workspace name/ID to set
         project: Project name/ID to set
+        
+    Returns:
+        Dictionary with the updated organization, workspace, and project
     """
     if not ctx:
-        return
+        return {
+            "organization": None,
+            "workspace": None,
+            "project": None
+        }
     
-    if organization:
-        await set_current_organization(organization, ctx)
-    if workspace:
-        await set_current_workspace(workspace, ctx)
-    if project:
-        await set_current_project(project, ctx)
+    values = {
+        name: value
+        for name, value in (
+            ("organization", organization),
+            ("workspace", workspace),
+            ("project", project),
+        )
+        if value
+    }
+    return await _update_context(ctx, **values)
 
 
 async def get_session_context(ctx: Optional[Context] = None) -> Dict[str, Optional[str]]:
@@ -348,32 +410,32 @@ async def get_session_context(ctx: Optional[Context] = None) -> Dict[str, Option
             "project": None
         }
     
+    stored = await _backend(ctx).get(SESSION_KEY_CONTEXT) or {}
     return {
-        "organization": await get_current_organization(ctx),
-        "workspace": await get_current_workspace(ctx),
-        "project": await get_current_project(ctx)
+        "organization": stored.get("organization"),
+        "workspace": stored.get("workspace"),
+        "project": stored.get("project")
     }
 
 
-async def clear_session_context(ctx: Optional[Context] = None) -> None:
+async def clear_session_context(ctx: Optional[Context] = None) -> Optional[str]:
     """Clear all context values from session state.
     
     Args:
         ctx: FastMCP Context object
+        
+    Returns:
+        The session ID the context was cleared for, or None if no context
     """
     if not ctx:
-        return
+        return None
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        await ctx.remove_session_state(SESSION_KEY_ORGANIZATION)
-        await ctx.remove_session_state(SESSION_KEY_WORKSPACE)
-        await ctx.remove_session_state(SESSION_KEY_PROJECT)
-    else:
-        _fb_remove(session_id, SESSION_KEY_ORGANIZATION)
-        _fb_remove(session_id, SESSION_KEY_WORKSPACE)
-        _fb_remove(session_id, SESSION_KEY_PROJECT)
+    backend = _backend(ctx)
+    # Sessions stored by older versions are fully cleared too; the removals
+    # run as one batch
+    await backend.remove_many(_CONTEXT_KEYS)
     logger.info("[Context] Cleared all session context")
+    return backend.session_id
 
 
 # ============================================================================
@@ -391,16 +453,8 @@ async def set_preference(key: str, value: Any, ctx: Optional[Context] = None) ->
     if not ctx:
         return
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        preferences = await ctx.get_session_state(SESSION_KEY_PREFERENCES) or {}
-        preferences[key] = value
-        await ctx.set_session_state(SESSION_KEY_PREFERENCES, preferences)
-    else:
-        prefs = _fb_get(session_id, SESSION_KEY_PREFERENCES) or {}
-        prefs[key] = value
-        _fb_set(session_id, SESSION_KEY_PREFERENCES, prefs)
-    logger.debug(f"[Preferences] Set {key}={value}")
+    await _merge_state(_backend(ctx), SESSION_KEY_PREFERENCES, {key: value})
+    logger.debug("[Preferences] Set %s=%s", key, value)
 
 
 async def get_preference(key: str, default: Any = None, ctx: Optional[Context] = None) -> Any:
@@ -417,11 +471,7 @@ async def get_preference(key: str, default: Any = None, ctx: Optional[Context] =
     if not ctx:
         return default
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        preferences = await ctx.get_session_state(SESSION_KEY_PREFERENCES) or {}
-    else:
-        preferences = _fb_get(session_id, SESSION_KEY_PREFERENCES) or {}
+    preferences = await _backend(ctx).get(SESSION_KEY_PREFERENCES) or {}
     return preferences.get(key, default)
 
 
@@ -434,11 +484,7 @@ async def get_all_preferences(ctx: Optional[Context] = None) -> Dict[str, Any]:
     if not ctx:
         return {}
 
-    session_id = get_session_id_safe(ctx)
-    if _has_native_session(ctx):
-        return await ctx.get_session_state(SESSION_KEY_PREFERENCES) or {}
-    else:
-        return _fb_get(session_id, SESSION_KEY_PREFERENCES) or {}
+    return await _backend(ctx).get(SESSION_KEY_PREFERENCES) or {}
 
 
 # ============================================================================
@@ -457,12 +503,22 @@ async def get_client_context(ctx: Optional[Context] = None) -> Dict[str, Any]:
     Returns:
         Dictionary with client context information
     """
-    if not ctx:
-        return {}
-    
     return await client_context.get_client_context(ctx)
 
 
+async def get_client_fields(ctx: Optional[Context], *fields: str) -> Tuple[Any, ...]:
+    """Get several client context fields with one session-state read.
+    
+    Args:
+        ctx: FastMCP Context object
+        *fields: Client context field names, e.g. 'region', 'agent_name'
+        
+    Returns:
+        Tuple with the value of each requested field, or None where not set
+    """
+    return await client_context.get_client_fields(ctx, *fields)
+
+
 async def get_client_region(ctx: Optional[Context] = None) -> Optional[str]:
     """Get the AWS region from client context.
     
@@ -472,9 +528,6 @@ async def get_client_region(ctx: Optional[Context] = None) -> Optional[str]:
     Returns:
         AWS region string or None if not available
     """
-    if not ctx:
-        return None
-    
     return await client_context.get_client_region(ctx)
 
 
@@ -487,9 +540,6 @@ async def get_client_agent(ctx: Optional[Context] = None) -> Optional[str]:
     Returns:
         Agent name string or None if not available
     """
-    if not ctx:
-        return None
-    
     return await client_context.get_client_agent(ctx)
 
 
@@ -502,9 +552,6 @@ async def get_client_timestamp(ctx: Optional[Context] = None) -> Optional[float]
     Returns:
         Unix timestamp float or None if not available
     """
-    if not ctx:
-        return None
-    
     return await client_context.get_client_timestamp(ctx)
 
 
@@ -517,9 +564,6 @@ async def get_client_preferences(ctx: Optional[Context] = None) -> Dict[str, Any
     Returns:
         Dictionary of user preferences or empty dict if not available
     """
-    if not ctx:
-        return {}
-    
     return await client_context.get_client_preferences(ctx)
 
 
@@ -555,29 +599,32 @@ async def get_session_info(ctx: Optional[Context] = None) -> Dict[str, Any]:
             "client_context": {}
         }
     
-    session_id = get_session_id_safe(ctx)
-    token = await get_session_token(ctx)
-    context = await get_session_context(ctx)
-    preferences = await get_all_preferences(ctx)
-    client_context = await get_client_context(ctx)
-    
-    # Add individual client context fields for easy access
-    client_region = await get_client_region(ctx)
-    client_agent = await get_client_agent(ctx)
-    client_timestamp = await get_client_timestamp(ctx)
-    client_preferences = await get_client_preferences(ctx)
+    backend = _backend(ctx)
+    session_id = backend.session_id
+    state = await backend.get_many(_SESSION_INFO_KEYS)
+    stored_context = state[SESSION_KEY_CONTEXT] or {}
+    client_ctx = state[SESSION_KEY_CLIENT_CONTEXT]
+    if client_ctx:
+        client_info = {
+            **client_ctx,
+            "region": client_ctx.get('region'),
+            "agent_name": client_ctx.get('agent_name'),
+            "timestamp": client_ctx.get('timestamp'),
+            "preferences": client_ctx.get('preferences') or {}
+        }
+    else:
+        # Sessions without AgentCore metadata skip the merge entirely
+        client_info = {"region": None, "agent_name": None, "timestamp": None, "preferences": {}}
     
     return {
         "session_id": session_id,
         "transport": getattr(ctx, 'transport', None),
-        "has_token": bool(token),
-        "context": context,
-        "preferences": preferences,
-        "client_context": {
-            **client_context,
-            "region": client_region,
-            "agent_name": client_agent,
-            "timestamp": client_timestamp,
-            "preferences": client_preferences
-        }
+        "has_token": bool(state[SESSION_KEY_TOKEN]),
+        "context": {
+            "organization": stored_context.get("organization"),
+            "workspace": stored_context.get("workspace"),
+            "project": stored_context.get("project")
+        },
+        "preferences": state[SESSION_KEY_PREFERENCES] or {},
+        "client_context": client_info
     }
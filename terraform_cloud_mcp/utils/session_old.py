@@ -5,16 +5,45 @@ such as the Terraform Cloud API token. Supports multi-session architecture
 with TTL-based expiration for streamable-http mode.
 """
 
-import asyncio
 import hashlib
+import heapq
 import logging
+import os
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from fastmcp import Context
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Stale entries the expiry heap may hold beyond twice the live session count
+# before it is rebuilt
+_EXPIRY_HEAP_SLACK = 16
+
+# Lowercased session ID headers checked by extract_session_id, in priority order
+_SESSION_ID_HEADERS = ('mcp-session-id', 'x-session-id')
+
+# Context instance attribute memoizing the ID resolved by get_current_session_id
+_RESOLVED_SESSION_ID_ATTR = '_tfc_resolved_session_id'
+
+# Attributes that may hold the transport/session ID, checked in order
+_SESSION_ID_ATTRS = ('id', 'session_id', 'transport_id', '_id', '_session_id', '_transport_id')
+_REQUEST_CONTEXT_ID_ATTRS = ('session_id', 'transport_id', 'sessionId', 'transportId')
+
+# Lowercased transport/session ID headers checked by get_current_session_id, in order
+_TRANSPORT_ID_HEADERS = ('mcp-session-id', 'x-session-id', 'x-transport-id', 'x-mcp-session-id')
+
+
+def _session_id_from_token(token: str) -> str:
+    """Derive a 32-character hex session ID from a bearer token.
+
+    The ID only needs to be stable per token, so BLAKE2b with a 16-byte digest
+    is used rather than a truncated SHA-256. The result is not cached, since
+    a cache keyed by the token would keep plaintext tokens in memory.
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
 
 def extract_session_id(request_context: Dict[str, Any]) -> str:
     """Extract session ID from HTTP request context.
@@ -33,25 +62,21 @@ def extract_session_id(request_context: Dict[str, Any]) -> str:
     Returns:
         The extracted or generated session ID
     """
-    headers = request_context.get('headers', {})
+    # Lowercase the header names once, so each candidate is a single lookup
+    headers = {name.lower(): value for name, value in request_context.get('headers', {}).items()}
 
-    # Try AWS Bedrock AgentCore's Mcp-Session-Id header first (case-insensitive)
-    session_id = headers.get('Mcp-Session-Id') or headers.get('mcp-session-id')
-    if session_id:
-        return session_id
-
-    # Fallback to X-Session-ID header (case-insensitive)
-    session_id = headers.get('X-Session-ID') or headers.get('x-session-id')
-    if session_id:
-        return session_id
+    # AWS Bedrock AgentCore's Mcp-Session-Id header first, then X-Session-ID
+    for header_name in _SESSION_ID_HEADERS:
+        session_id = headers.get(header_name)
+        if session_id:
+            return session_id
 
-    # Fallback to Authorization header
-    auth_header = headers.get('Authorization') or headers.get('authorization')
+    # Fallback to Authorization header; only hashed when no session header is set
+    auth_header = headers.get('authorization')
     if auth_header and auth_header.startswith('Bearer '):
         # Generate a deterministic session ID from the token
         token = auth_header[7:]  # Remove 'Bearer ' prefix
-        # Use SHA256 hash of token, take first 32 characters
-        session_id = hashlib.sha256(token.encode()).hexdigest()[:32]
+        session_id = _session_id_from_token(token)
         logger.debug(f"Generated session ID from Authorization header")
         return session_id
 
@@ -60,17 +85,26 @@ def extract_session_id(request_context: Dict[str, Any]) -> str:
     return 'default'
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionData:
-    """Per-session data structure."""
+    """Per-session data structure.
+
+    Expiry is tracked as a time.monotonic() deadline so checking it is a single
+    float comparison; created_at is wall-clock time kept for logging only.
+    """
     token: str
     created_at: datetime
     ttl_seconds: int
-    last_accessed: datetime = field(default_factory=datetime.now)
+    expires_at: float
+    last_accessed: float = field(default_factory=time.monotonic)
 
 
 class MultiSessionStorage:
-    """Thread-safe storage for multiple sessions with TTL support."""
+    """Storage for multiple sessions with TTL support.
+
+    Safe for concurrent use from one event loop: no method awaits while it
+    updates the storage, so calls never interleave.
+    """
 
     def __init__(self, default_ttl_seconds: int = 1800):
         """Initialize multi-session storage.
@@ -79,7 +113,8 @@ class MultiSessionStorage:
             default_ttl_seconds: Default TTL for sessions in seconds (default: 30 minutes)
         """
         self._sessions: Dict[str, SessionData] = {}
-        self._lock = asyncio.Lock()
+        # (expires_at, session_id) for every token set, soonest deadline first
+        self._expiry_heap: List[Tuple[float, str]] = []
         self._default_ttl = default_ttl_seconds
 
     async def set_token(self, session_id: str, token: str) -> None:
@@ -89,14 +124,19 @@ class MultiSessionStorage:
             session_id: Unique identifier for the session
             token: The Terraform Cloud API token to store
         """
-        async with self._lock:
-            self._sessions[session_id] = SessionData(
-                token=token,
-                created_at=datetime.now(),
-                ttl_seconds=self._default_ttl
-            )
-            masked_token = f"{token[:8]}...{token[-4:]}" if token else "None"
-            logger.info(f"Token set for session '{session_id}' (masked: {masked_token})")
+        # No locking: nothing here awaits, so on the event loop the update
+        # runs atomically with respect to every other storage call
+        expires_at = time.monotonic() + self._default_ttl
+        self._sessions[session_id] = SessionData(
+            token=token,
+            created_at=datetime.now(),
+            ttl_seconds=self._default_ttl,
+            expires_at=expires_at
+        )
+        heapq.heappush(self._expiry_heap, (expires_at, session_id))
+        self._prune_expired()
+        masked_token = f"{token[:8]}...{token[-4:]}" if token else "None"
+        logger.info(f"Token set for session '{session_id}' (masked: {masked_token})")
 
     async def get_token(self, session_id: str) -> Optional[str]:
         """Retrieve the stored Terraform Cloud API token for session.
@@ -107,19 +147,21 @@ class MultiSessionStorage:
         Returns:
             The stored token, or None if session doesn't exist or is expired
         """
-        async with self._lock:
-            session = self._sessions.get(session_id)
-            if not session:
-                return None
-
-            if self._is_expired(session):
-                logger.info(f"Session '{session_id}' expired, clearing")
-                del self._sessions[session_id]
-                return None
-
-            # Update last accessed time
-            session.last_accessed = datetime.now()
-            return session.token
+        # Nothing below awaits, so this runs atomically on the event loop
+        session = self._sessions.get(session_id)
+        if not session:
+            return None
+
+        # One clock read serves both the expiry check and the access time
+        now = time.monotonic()
+        if session.expires_at < now:
+            logger.info(f"Session '{session_id}' expired, clearing")
+            del self._sessions[session_id]
+            return None
+
+        # Update last accessed time
+        session.last_accessed = now
+        return session.token
 
     async def clear_token(self, session_id: str) -> None:
         """Clear the stored token from session.
@@ -127,10 +169,9 @@ class MultiSessionStorage:
         Args:
             session_id: Unique identifier for the session
         """
-        async with self._lock:
-            if session_id in self._sessions:
-                del self._sessions[session_id]
-                logger.info(f"Token cleared for session '{session_id}'")
+        if self._sessions.pop(session_id, None) is not None:
+            logger.info(f"Token cleared for session '{session_id}'")
+        self._prune_expired()
 
     async def get_all_sessions(self) -> Dict[str, SessionData]:
         """Get all active sessions.
@@ -138,34 +179,38 @@ class MultiSessionStorage:
         Returns:
             Dictionary mapping session IDs to SessionData objects
         """
-        async with self._lock:
-            # Clean up expired sessions first
-            expired_sessions = [
-                sid for sid, session in self._sessions.items()
-                if self._is_expired(session)
-            ]
-            for sid in expired_sessions:
-                logger.info(f"Cleaning up expired session '{sid}'")
-                del self._sessions[sid]
-
-            return dict(self._sessions)
+        self._prune_expired()
+        return dict(self._sessions)
 
-    def _is_expired(self, session: SessionData) -> bool:
-        """Check if session has expired based on TTL.
-
-        Args:
-            session: The session data to check
+    def _prune_expired(self) -> None:
+        """Drop expired sessions and keep the expiry heap bounded.
 
-        Returns:
-            True if session has expired, False otherwise
+        Expired sessions are popped off the heap, so the sweep only touches
+        sessions whose deadline has passed. Entries left behind by a later
+        set_token or a clear_token are skipped when they surface, and once
+        they outnumber the live sessions the heap is rebuilt from
+        self._sessions, so its size stays proportional to the live sessions.
         """
-        elapsed = (datetime.now() - session.created_at).total_seconds()
-        return elapsed > session.ttl_seconds
+        heap = self._expiry_heap
+        now = time.monotonic()
+        while heap and heap[0][0] < now:
+            expires_at, sid = heapq.heappop(heap)
+            session = self._sessions.get(sid)
+            # Skip entries superseded by a later set_token or already cleared
+            if session is not None and session.expires_at == expires_at:
+                logger.info(f"Cleaning up expired session '{sid}'")
+                del self._sessions[sid]
+
+        if len(heap) > 2 * len(self._sessions) + _EXPIRY_HEAP_SLACK:
+            heap[:] = [(session.expires_at, sid) for sid, session in self._sessions.items()]
+            heapq.heapify(heap)
 
 
 # Global session storage instance - one per MCP server instance
 # Supports multiple concurrent sessions with TTL-based expiration
-_session_storage = None
+_session_storage = MultiSessionStorage(
+    default_ttl_seconds=int(os.getenv("SESSION_TTL_SECONDS", "1800"))
+)
 
 
 def get_session_storage() -> MultiSessionStorage:
@@ -174,12 +219,6 @@ def get_session_storage() -> MultiSessionStorage:
     Returns:
         The global MultiSessionStorage instance
     """
-    global _session_storage
-    if _session_storage is None:
-        # Read TTL from environment variable
-        import os
-        ttl_seconds = int(os.getenv("SESSION_TTL_SECONDS", "1800"))
-        _session_storage = MultiSessionStorage(default_ttl_seconds=ttl_seconds)
     return _session_storage
 
 
@@ -198,6 +237,9 @@ def get_current_session_id(ctx: Optional[Context] = None) -> str:
     - ctx.request_id changes per request (NOT suitable for session isolation)
     - Need to find the actual transport/session ID (constant for entire session)
 
+    The resolved ID is memoized on the context, so repeated lookups within
+    one request skip the attribute and header probing.
+
     Args:
         ctx: Optional FastMCP Context object
 
@@ -211,45 +253,50 @@ def get_current_session_id(ctx: Optional[Context] = None) -> str:
         logger.debug("[Get Session ID] No context provided, using 'default' session ID")
         return 'default'
 
+    ctx_dict = getattr(ctx, '__dict__', None)
+    if ctx_dict is not None:
+        cached = ctx_dict.get(_RESOLVED_SESSION_ID_ATTR)
+        if cached is not None:
+            return cached
+
+    session_id = _resolve_session_id(ctx)
+    if ctx_dict is not None:
+        ctx_dict[_RESOLVED_SESSION_ID_ATTR] = session_id
+    return session_id
+
+
+def _resolve_session_id(ctx: Context) -> str:
+    """Resolve the session ID for get_current_session_id without memoization."""
     # Try session_id first (available after session establishment)
-    if hasattr(ctx, 'session_id') and ctx.session_id:
-        logger.info(f"[Get Session ID] Retrieved from ctx.session_id: '{ctx.session_id}'")
-        return ctx.session_id
+    ctx_session_id = getattr(ctx, 'session_id', None)
+    if ctx_session_id:
+        logger.info(f"[Get Session ID] Retrieved from ctx.session_id: '{ctx_session_id}'")
+        return ctx_session_id
 
     # Try to extract from session object or request_context
     # These might contain the transport/session ID
-    if hasattr(ctx, 'session') and ctx.session:
-        session = ctx.session
-        # Check for session ID or transport ID attributes
-        for attr_name in ['id', 'session_id', 'transport_id', '_id', '_session_id', '_transport_id']:
-            if hasattr(session, attr_name):
-                value = getattr(session, attr_name)
-                if value:
-                    logger.info(f"[Get Session ID] Retrieved from ctx.session.{attr_name}: '{value}'")
-                    return str(value)
-
-    if hasattr(ctx, 'request_context') and ctx.request_context:
-        request_ctx = ctx.request_context
-        # Check for session ID or transport ID in request context
-        for attr_name in ['session_id', 'transport_id', 'sessionId', 'transportId']:
-            if hasattr(request_ctx, attr_name):
-                value = getattr(request_ctx, attr_name)
-                if value:
-                    logger.info(f"[Get Session ID] Retrieved from ctx.request_context.{attr_name}: '{value}'")
-                    return str(value)
+    for owner_name, owner, attr_names in (
+        ('session', getattr(ctx, 'session', None), _SESSION_ID_ATTRS),
+        ('request_context', getattr(ctx, 'request_context', None), _REQUEST_CONTEXT_ID_ATTRS),
+    ):
+        if not owner:
+            continue
+        for attr_name in attr_names:
+            value = getattr(owner, attr_name, None)
+            if value:
+                logger.info(f"[Get Session ID] Retrieved from ctx.{owner_name}.{attr_name}: '{value}'")
+                return str(value)
 
     # Try to extract from request headers (AgentCore Gateway sends transport ID here)
     if hasattr(ctx, 'get_http_request'):
         try:
             request = ctx.get_http_request()
             if hasattr(request, 'headers'):
-                headers = dict(request.headers)
-                # Try various possible header names for transport/session ID
-                for header_name in ['Mcp-Session-Id', 'mcp-session-id', 'X-Session-ID',
-                                  'x-session-id', 'X-Transport-Id', 'x-transport-id',
-                                  'X-MCP-Session-Id', 'x-mcp-session-id']:
-                    if header_name in headers:
-                        session_id = headers[header_name]
+                # One pass lowercases the names; each candidate is then a single lookup
+                headers = {name.lower(): value for name, value in request.headers.items()}
+                for header_name in _TRANSPORT_ID_HEADERS:
+                    session_id = headers.get(header_name)
+                    if session_id:
                         logger.info(f"[Get Session ID] Extracted from {header_name} header: '{session_id}'")
                         return session_id
         except Exception as e:
@@ -269,14 +316,16 @@ def get_current_session_id(ctx: Optional[Context] = None) -> str:
             raise ValueError(error_msg)
 
     # Fall back to request_id (only for stdio mode, not suitable for HTTP transports)
-    if hasattr(ctx, 'request_id') and ctx.request_id:
-        logger.info(f"[Get Session ID] Retrieved from ctx.request_id (WARNING: changes per request): '{ctx.request_id}'")
-        return str(ctx.request_id)
+    request_id = getattr(ctx, 'request_id', None)
+    if request_id:
+        logger.info(f"[Get Session ID] Retrieved from ctx.request_id (WARNING: changes per request): '{request_id}'")
+        return str(request_id)
 
     # Fall back to client_id
-    if hasattr(ctx, 'client_id') and ctx.client_id:
-        logger.info(f"[Get Session ID] Retrieved from ctx.client_id: '{ctx.client_id}'")
-        return str(ctx.client_id)
+    client_id = getattr(ctx, 'client_id', None)
+    if client_id:
+        logger.info(f"[Get Session ID] Retrieved from ctx.client_id: '{client_id}'")
+        return str(client_id)
 
     # Default to 'default' for stdio mode
     logger.debug("[Get Session ID] Using 'default' session ID")
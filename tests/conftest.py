@@ -0,0 +1,16 @@
+"""Shared pytest configuration for the test suite."""
+
+# Run the async tests on uvloop when it is installed (the "test" extra); the
+# suite is dominated by tiny awaits, so the C event loop cuts most of the
+# scheduling overhead. Without uvloop the hook isn't defined and
+# pytest-asyncio's default loop applies.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+if uvloop is not None:
+
+    def pytest_asyncio_loop_factories(config, item):
+        """Create every async test's event loop with uvloop."""
+        return {"uvloop": uvloop.new_event_loop}
@@ -5,57 +5,137 @@ through storage and retrieval, ensuring that client metadata from AWS Bedrock
 AgentCore Gateway is properly handled.
 """
 
+import asyncio
 import pytest
 import json
-from unittest.mock import Mock, AsyncMock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 from typing import Dict, Any
 
 from fastmcp import Context
+from starlette.datastructures import Headers
 from terraform_cloud_mcp.utils.client_context import (
     extract_client_context_from_headers,
     store_client_context,
     get_client_context,
+    get_client_fields,
     get_client_region,
     get_client_agent,
     get_client_timestamp,
     get_client_preferences,
     clear_client_context,
+    _load_preferences_json,
 )
+from terraform_cloud_mcp.utils._session_core import has_native_session
+from terraform_cloud_mcp.utils.session import get_session_id_safe
+
+# Preference parsers the extractor may run with; orjson is optional
+try:
+    import orjson
+    JSON_LOADERS = [json.loads, orjson.loads]
+except ImportError:
+    JSON_LOADERS = [json.loads]
+
+# Timestamp parsers: None selects the float() path; fastnumbers is optional
+try:
+    from fastnumbers import fast_float
+    FAST_FLOATS = [None, fast_float]
+except ImportError:
+    FAST_FLOATS = [None]
+
+# Header fixtures shared across tests, built once at import; tests never mutate them
+COMPLETE_PREFERENCES = {
+    "auto_format": True,
+    "show_raw": False,
+    "show_tools": True,
+    "show_thinking": False
+}
+COMPLETE_HEADERS = {
+    'X-Session-ID': 'test-session-123',
+    'X-Client-Region': 'us-west-2',
+    'X-Client-Agent': 'TFC-Agent',
+    'X-Client-Timestamp': '1705000000.0',
+    'X-Client-Preferences': json.dumps(COMPLETE_PREFERENCES),
+    'Content-Type': 'application/json',
+    'Authorization': 'Bearer token123'
+}
+
+INTEGRATION_PREFERENCES = {
+    'auto_format': True,
+    'show_raw': False
+}
+INTEGRATION_HEADERS = {
+    'X-Session-ID': 'integration-test-123',
+    'X-Client-Region': 'ca-central-1',
+    'X-Client-Agent': 'Integration-Test-Agent',
+    'X-Client-Timestamp': '1705000000.0',
+    'X-Client-Preferences': json.dumps(INTEGRATION_PREFERENCES)
+}
 
 
 class MockRequest:
-    """Mock HTTP request with headers."""
+    """Mock HTTP request with headers.
+    
+    Headers use Starlette's case-insensitive Headers, as on a real request,
+    so the extractor's raw ASGI bytes path is the one under test. Like a
+    real request it accepts new attributes, where per-request lookups are
+    cached.
+    """
     
     def __init__(self, headers: Dict[str, str]):
-        self.headers = headers
+        self.headers = Headers(headers=headers)
 
 
 class MockRequestContext:
     """Mock request context containing the HTTP request."""
     
+    __slots__ = ('request',)
+    
     def __init__(self, headers: Dict[str, str]):
         self.request = MockRequest(headers)
 
 
 class MockContext:
-    """Mock FastMCP Context for testing."""
+    """Mock FastMCP Context for testing.
+    
+    Unlike the request mocks this keeps its __dict__: a real Context has one,
+    and the per-context session backend and client context caches live there.
+    """
     
     def __init__(self, headers: Dict[str, str] = None, has_native_session: bool = True):
         self.request_context = MockRequestContext(headers or {})
         self._session_state = {}
         self._has_native = has_native_session
     
-    async def set_session_state(self, key: str, value: Any):
+    # The state methods do plain dict operations and hand back an already
+    # completed future, which callers await exactly like a coroutine
+    
+    @staticmethod
+    def _done(result: Any = None) -> "asyncio.Future[Any]":
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(result)
+        return future
+    
+    def set_session_state(self, key: str, value: Any) -> "asyncio.Future[Any]":
         """Mock native session state storage."""
         self._session_state[key] = value
+        return self._done()
     
-    async def get_session_state(self, key: str) -> Any:
+    def get_session_state(self, key: str) -> "asyncio.Future[Any]":
         """Mock native session state retrieval."""
-        return self._session_state.get(key)
+        return self._done(self._session_state.get(key))
     
-    async def remove_session_state(self, key: str):
+    def remove_session_state(self, key: str) -> "asyncio.Future[Any]":
         """Mock native session state removal."""
         self._session_state.pop(key, None)
+        return self._done()
+
+
+class MockFallbackContext:
+    """Mock FastMCP Context without native session state (older FastMCP)."""
+    
+    def __init__(self, headers: Dict[str, str] = None):
+        self.request_context = MockRequestContext(headers or {})
 
 
 class TestClientContextExtraction:
@@ -63,34 +143,14 @@ class TestClientContextExtraction:
     
     def test_extract_all_client_context_headers(self):
         """Test extraction of all client context headers."""
-        headers = {
-            'X-Session-ID': 'test-session-123',
-            'X-Client-Region': 'us-west-2',
-            'X-Client-Agent': 'TFC-Agent',
-            'X-Client-Timestamp': '1705000000.0',
-            'X-Client-Preferences': json.dumps({
-                "auto_format": True,
-                "show_raw": False,
-                "show_tools": True,
-                "show_thinking": False
-            }),
-            'Content-Type': 'application/json',
-            'Authorization': 'Bearer token123'
-        }
-        
-        ctx = MockContext(headers)
+        ctx = MockContext(COMPLETE_HEADERS)
         
         result = extract_client_context_from_headers(ctx)
         
         assert result['region'] == 'us-west-2'
         assert result['agent_name'] == 'TFC-Agent'
         assert result['timestamp'] == 1705000000.0
-        assert result['preferences'] == {
-            "auto_format": True,
-            "show_raw": False,
-            "show_tools": True,
-            "show_thinking": False
-        }
+        assert result['preferences'] == COMPLETE_PREFERENCES
         assert 'raw_headers' in result
         assert result['raw_headers']['X-Client-Region'] == 'us-west-2'
     
@@ -141,6 +201,19 @@ class TestClientContextExtraction:
         assert 'timestamp' not in result
         assert result == {}  # No valid headers extracted
     
+    @pytest.mark.parametrize("fast_float", FAST_FLOATS)
+    def test_extract_timestamp_with_each_float_parser(self, fast_float):
+        """Test timestamp parsing behaves the same with fastnumbers and float()."""
+        valid_ctx = MockContext({'X-Client-Timestamp': '1705000000.5'})
+        invalid_ctx = MockContext({'X-Client-Timestamp': 'not-a-number'})
+        
+        with patch('terraform_cloud_mcp.utils.client_context._fast_float', fast_float):
+            valid = extract_client_context_from_headers(valid_ctx)
+            invalid = extract_client_context_from_headers(invalid_ctx)
+        
+        assert valid['timestamp'] == 1705000000.5
+        assert invalid == {}
+    
     def test_extract_invalid_preferences_json(self):
         """Test extraction with invalid JSON in preferences header."""
         headers = {
@@ -154,6 +227,43 @@ class TestClientContextExtraction:
         
         assert 'preferences' not in result
     
+    @pytest.mark.parametrize("loads", JSON_LOADERS)
+    def test_extract_preferences_with_each_json_parser(self, loads):
+        """Test preferences parsing behaves the same with orjson and stdlib json."""
+        valid_ctx = MockContext({'X-Client-Preferences': json.dumps({"show_raw": True})})
+        invalid_ctx = MockContext({'X-Client-Preferences': '{"show_raw": true} trailing'})
+        
+        # Decoded preferences are memoized; start cold so this loader runs
+        _load_preferences_json.cache_clear()
+        with patch('terraform_cloud_mcp.utils.client_context._json_loads', loads):
+            valid = extract_client_context_from_headers(valid_ctx)
+            invalid = extract_client_context_from_headers(invalid_ctx)
+        
+        assert valid['preferences'] == {"show_raw": True}
+        assert 'preferences' not in invalid
+    
+    def test_extract_repeated_preferences_are_not_shared(self):
+        """Test memoized preferences are copied for each request."""
+        headers = {'X-Client-Preferences': json.dumps(INTEGRATION_PREFERENCES)}
+        
+        first = extract_client_context_from_headers(MockContext(headers))
+        second = extract_client_context_from_headers(MockContext(headers))
+        
+        assert first['preferences'] == second['preferences'] == INTEGRATION_PREFERENCES
+        first['preferences']['show_raw'] = True
+        assert second['preferences']['show_raw'] is False
+    
+    def test_extract_repeated_nested_preferences_are_not_shared(self):
+        """Test nested values in memoized preferences are copied too."""
+        headers = {'X-Client-Preferences': json.dumps({'columns': ['name'], 'filters': {'status': 'ok'}})}
+        
+        first = extract_client_context_from_headers(MockContext(headers))
+        first['preferences']['columns'].append('id')
+        first['preferences']['filters']['status'] = 'errored'
+        second = extract_client_context_from_headers(MockContext(headers))
+        
+        assert second['preferences'] == {'columns': ['name'], 'filters': {'status': 'ok'}}
+    
     def test_extract_preferences_not_dict(self):
         """Test extraction when preferences is not a dictionary."""
         headers = {
@@ -189,8 +299,7 @@ class TestClientContextExtraction:
     
     def test_extract_no_request_context(self):
         """Test extraction with no request context."""
-        ctx = Mock()
-        ctx.request_context = None
+        ctx = SimpleNamespace(request_context=None)
         
         result = extract_client_context_from_headers(ctx)
         assert result == {}
@@ -212,18 +321,56 @@ class TestClientContextStorage:
         
         await store_client_context(ctx, client_context_data)
         
-        # Verify all keys were stored
-        assert 'client_context' in ctx._session_state
-        assert 'client_region' in ctx._session_state
-        assert 'client_agent' in ctx._session_state
-        assert 'client_timestamp' in ctx._session_state
-        assert 'client_preferences' in ctx._session_state
+        # Verify the complete context was stored under a single key
+        assert ctx._session_state == {'client_context': client_context_data}
+        
+        # Individual fields are derived from the stored context
+        assert await get_client_region(ctx) == 'us-east-1'
+        assert await get_client_agent(ctx) == 'Test-Agent'
+        assert await get_client_timestamp(ctx) == 1705000000.0
+        assert await get_client_preferences(ctx) == {'auto_format': True}
+    
+    async def test_store_client_context_single_write(self):
+        """Test storing a complete client context costs one session-state write."""
+        ctx = MockContext(has_native_session=True)
+        
+        with patch.object(ctx, 'set_session_state', wraps=ctx.set_session_state) as write:
+            await store_client_context(ctx, {
+                'region': 'us-east-1',
+                'agent_name': 'Test-Agent',
+                'timestamp': 1705000000.0,
+                'preferences': {'auto_format': True}
+            })
+        
+        write.assert_called_once()
+    
+    async def test_store_client_context_fallback_session(self):
+        """Test storing client context without native session state."""
+        headers = {'X-Session-ID': 'fallback-store-test'}
+        client_context_data = {'region': 'sa-east-1'}
+        
+        await store_client_context(MockFallbackContext(headers), client_context_data)
+        
+        # A later request in the same session reads it from the fallback store
+        ctx = MockFallbackContext(headers)
+        assert await get_client_region(ctx) == 'sa-east-1'
+        
+        await clear_client_context(ctx)
+        assert await get_client_context(MockFallbackContext(headers)) == {}
+    
+    async def test_session_backend_resolved_once_per_context(self):
+        """Test the native/fallback choice is made once, not on every call."""
+        ctx = MockContext(has_native_session=True)
+        
+        with patch(
+            'terraform_cloud_mcp.utils._session_core.has_native_session',
+            wraps=has_native_session,
+        ) as probe:
+            await store_client_context(ctx, {'region': 'us-east-2'})
+            await get_client_region(ctx)
+            await clear_client_context(ctx)
         
-        assert ctx._session_state['client_context'] == client_context_data
-        assert ctx._session_state['client_region'] == 'us-east-1'
-        assert ctx._session_state['client_agent'] == 'Test-Agent'
-        assert ctx._session_state['client_timestamp'] == 1705000000.0
-        assert ctx._session_state['client_preferences'] == {'auto_format': True}
+        assert probe.call_count == 1
     
     async def test_store_partial_client_context(self):
         """Test storing partial client context (some fields missing)."""
@@ -235,11 +382,11 @@ class TestClientContextStorage:
         
         await store_client_context(ctx, client_context_data)
         
-        # Only region should be stored
-        assert ctx._session_state['client_region'] == 'eu-west-1'
-        assert 'client_agent' not in ctx._session_state
-        assert 'client_timestamp' not in ctx._session_state
-        assert 'client_preferences' not in ctx._session_state
+        # Only region should be available
+        assert await get_client_region(ctx) == 'eu-west-1'
+        assert await get_client_agent(ctx) is None
+        assert await get_client_timestamp(ctx) is None
+        assert await get_client_preferences(ctx) == {}
     
     async def test_store_empty_client_context(self):
         """Test storing empty client context."""
@@ -297,7 +444,7 @@ class TestClientContextRetrieval:
     async def test_get_client_region(self):
         """Test retrieving client region."""
         ctx = MockContext(has_native_session=True)
-        await ctx.set_session_state('client_region', 'ap-northeast-1')
+        await ctx.set_session_state('client_context', {'region': 'ap-northeast-1'})
         
         result = await get_client_region(ctx)
         
@@ -314,7 +461,7 @@ class TestClientContextRetrieval:
     async def test_get_client_agent(self):
         """Test retrieving client agent."""
         ctx = MockContext(has_native_session=True)
-        await ctx.set_session_state('client_agent', 'My-Agent')
+        await ctx.set_session_state('client_context', {'agent_name': 'My-Agent'})
         
         result = await get_client_agent(ctx)
         
@@ -323,7 +470,7 @@ class TestClientContextRetrieval:
     async def test_get_client_timestamp(self):
         """Test retrieving client timestamp."""
         ctx = MockContext(has_native_session=True)
-        await ctx.set_session_state('client_timestamp', 1705000000.0)
+        await ctx.set_session_state('client_context', {'timestamp': 1705000000.0})
         
         result = await get_client_timestamp(ctx)
         
@@ -333,7 +480,7 @@ class TestClientContextRetrieval:
         """Test retrieving client preferences."""
         ctx = MockContext(has_native_session=True)
         preferences = {'auto_format': False, 'show_raw': True}
-        await ctx.set_session_state('client_preferences', preferences)
+        await ctx.set_session_state('client_context', {'preferences': preferences})
         
         result = await get_client_preferences(ctx)
         
@@ -346,6 +493,21 @@ class TestClientContextRetrieval:
         result = await get_client_preferences(ctx)
         
         assert result == {}
+    
+    async def test_get_client_fields(self):
+        """Test retrieving several client context fields at once."""
+        ctx = MockContext(has_native_session=True)
+        await ctx.set_session_state('client_context', {'region': 'eu-west-1', 'timestamp': 1705000000.0})
+        
+        result = await get_client_fields(ctx, 'region', 'agent_name', 'timestamp')
+        
+        assert result == ('eu-west-1', None, 1705000000.0)
+    
+    async def test_get_client_fields_none_context(self):
+        """Test retrieving client context fields without a context."""
+        result = await get_client_fields(None, 'region', 'agent_name')
+        
+        assert result == (None, None)
 
 
 class TestClientContextClearing:
@@ -384,17 +546,7 @@ class TestIntegration:
     async def test_extract_and_store_complete_flow(self):
         """Test complete flow: extract headers → store → retrieve."""
         # Step 1: Create context with headers
-        headers = {
-            'X-Session-ID': 'integration-test-123',
-            'X-Client-Region': 'ca-central-1',
-            'X-Client-Agent': 'Integration-Test-Agent',
-            'X-Client-Timestamp': '1705000000.0',
-            'X-Client-Preferences': json.dumps({
-                'auto_format': True,
-                'show_raw': False
-            })
-        }
-        ctx = MockContext(headers, has_native_session=True)
+        ctx = MockContext(INTEGRATION_HEADERS, has_native_session=True)
         
         # Step 2: Extract client context
         extracted = extract_client_context_from_headers(ctx)
@@ -415,7 +567,39 @@ class TestIntegration:
         assert agent == 'Integration-Test-Agent'
         
         preferences = await get_client_preferences(ctx)
-        assert preferences == {'auto_format': True, 'show_raw': False}
+        assert preferences == INTEGRATION_PREFERENCES
+    
+    async def test_get_client_fields_batch(self):
+        """Test a later request reads several stored fields with one state read."""
+        ctx = MockContext(INTEGRATION_HEADERS, has_native_session=True)
+        await store_client_context(ctx, extract_client_context_from_headers(ctx))
+    
+        # Next request in the same session: no per-request cache yet
+        next_ctx = MockContext(INTEGRATION_HEADERS, has_native_session=True)
+        next_ctx._session_state = ctx._session_state
+    
+        with patch.object(next_ctx, 'get_session_state', wraps=next_ctx.get_session_state) as read:
+            region, agent, preferences = await get_client_fields(
+                next_ctx, 'region', 'agent_name', 'preferences'
+            )
+    
+        assert (region, agent) == ('ca-central-1', 'Integration-Test-Agent')
+        assert preferences == INTEGRATION_PREFERENCES
+        read.assert_called_once_with('client_context')
+    
+    async def test_session_id_resolved_once_per_request(self):
+        """Test repeated session ID lookups extract client context only once."""
+        ctx = MockContext(INTEGRATION_HEADERS, has_native_session=True)
+        
+        with patch(
+            'terraform_cloud_mcp.utils.client_context.extract_client_context_from_headers',
+            wraps=extract_client_context_from_headers,
+        ) as extract:
+            session_ids = [get_session_id_safe(ctx) for _ in range(3)]
+            await asyncio.sleep(0)
+        
+        assert session_ids == ['integration-test-123'] * 3
+        extract.assert_called_once_with(ctx)
     
     async def test_backward_compatibility_no_headers(self):
         """Test that system works without client context headers (backward compatibility)."""